@@ -0,0 +1,210 @@
+import asyncio
+import argparse
+import socket
+import struct
+import time
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+from system_monitor import SystemMonitor
+
+DEFAULT_PORT = 9700
+
+# Frame: 4-byte big-endian payload length, 1-byte frame type, payload
+FRAME_HEADER = struct.Struct(">IB")
+FRAME_HELLO = 0
+FRAME_KEYFRAME = 1
+FRAME_DELTA = 2
+MAX_FRAME_SIZE = 64 * 1024
+
+# Flattened get_all_metrics fields, in wire order
+FIELDS: List[Tuple[str, Optional[str]]] = [
+    ("cpu", None),
+    ("memory", "total"), ("memory", "available"), ("memory", "percent"),
+    ("disk", "total"), ("disk", "used"), ("disk", "free"), ("disk", "percent"),
+    ("network", "sent"), ("network", "recv"),
+]
+
+_KEYFRAME_BODY = struct.Struct(">d%df" % len(FIELDS))
+_DELTA_HEAD = struct.Struct(">dH")
+_VALUE = struct.Struct(">f")
+
+
+def flatten_metrics(metrics: Dict[str, Any]) -> Tuple[float, ...]:
+    values = []
+    for group, key in FIELDS:
+        value = metrics.get(group, 0.0) if key is None else metrics.get(group, {}).get(key, 0.0)
+        # Round-trip through float32 so delta comparisons match what was sent
+        values.append(_VALUE.unpack(_VALUE.pack(float(value)))[0])
+    return tuple(values)
+
+
+def unflatten_metrics(values: Tuple[float, ...]) -> Dict[str, Any]:
+    metrics: Dict[str, Any] = {"memory": {}, "disk": {}, "network": {}}
+    for (group, key), value in zip(FIELDS, values):
+        value = round(value, 2)
+        if key is None:
+            metrics[group] = value
+        else:
+            metrics[group][key] = value
+    return metrics
+
+
+def encode_frame(frame_type: int, payload: bytes) -> bytes:
+    return FRAME_HEADER.pack(len(payload), frame_type) + payload
+
+
+def encode_hello(hostname: str) -> bytes:
+    return encode_frame(FRAME_HELLO, hostname.encode("utf-8"))
+
+
+def encode_snapshot(timestamp: float, values: Tuple[float, ...],
+                    previous: Optional[Tuple[float, ...]] = None) -> bytes:
+    """Encodes a keyframe, or a delta of the fields that differ from `previous`."""
+    if previous is None:
+        return encode_frame(FRAME_KEYFRAME, _KEYFRAME_BODY.pack(timestamp, *values))
+    mask = 0
+    changed = []
+    for i, (new, old) in enumerate(zip(values, previous)):
+        if new != old:
+            mask |= 1 << i
+            changed.append(_VALUE.pack(new))
+    return encode_frame(FRAME_DELTA, _DELTA_HEAD.pack(timestamp, mask) + b"".join(changed))
+
+
+def decode_snapshot(frame_type: int, payload: bytes,
+                    previous: Optional[Tuple[float, ...]]) -> Tuple[float, Tuple[float, ...]]:
+    """Decodes a keyframe or delta payload. Malformed frames raise ValueError."""
+    if frame_type == FRAME_KEYFRAME:
+        try:
+            timestamp, *values = _KEYFRAME_BODY.unpack(payload)
+        except struct.error as e:
+            raise ValueError(f"malformed keyframe: {e}") from e
+        return timestamp, tuple(values)
+    if frame_type == FRAME_DELTA:
+        if previous is None:
+            raise ValueError("delta frame received before keyframe")
+        try:
+            timestamp, mask = _DELTA_HEAD.unpack_from(payload, 0)
+            values = list(previous)
+            offset = _DELTA_HEAD.size
+            for i in range(len(FIELDS)):
+                if mask & (1 << i):
+                    values[i] = _VALUE.unpack_from(payload, offset)[0]
+                    offset += _VALUE.size
+        except struct.error as e:
+            raise ValueError(f"malformed delta: {e}") from e
+        return timestamp, tuple(values)
+    raise ValueError(f"unknown frame type {frame_type}")
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    length, frame_type = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"frame too large: {length} bytes")
+    return frame_type, await reader.readexactly(length)
+
+
+class MetricsAgent:
+    """
+    Streams SystemMonitor snapshots to every connected client. Each client
+    gets a keyframe, then deltas against what it was last sent. When a
+    client's socket buffer is above `high_water` the new sample is dropped
+    for that client instead of queued, so slow readers only ever see
+    fresh data.
+    """
+
+    def __init__(self, monitor: Optional[SystemMonitor] = None, interval: float = 1.0,
+                 keyframe_every: int = 60, high_water: int = 16 * 1024, hostname: Optional[str] = None):
+        self.monitor = monitor or SystemMonitor()
+        self.interval = interval
+        self.keyframe_every = keyframe_every
+        self.high_water = high_water
+        self.hostname = hostname or socket.gethostname()
+        self.dropped = 0
+        self._sample: Optional[Tuple[float, Tuple[float, ...]]] = None
+        self._clients: List[asyncio.Event] = []
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def serve(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, unix_path: Optional[str] = None):
+        if unix_path:
+            server = await asyncio.start_unix_server(self._handle_client, path=unix_path)
+        else:
+            server = await asyncio.start_server(self._handle_client, host, port)
+        self.server = server
+        sampler = asyncio.ensure_future(self._sample_loop())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sampler.cancel()
+
+    async def _sample_loop(self):
+        while True:
+            metrics = self.monitor.get_all_metrics()
+            self._sample = (time.time(), flatten_metrics(metrics))
+            for event in self._clients:
+                event.set()
+            await asyncio.sleep(self.interval)
+
+    @staticmethod
+    async def _discard_input(reader: asyncio.StreamReader):
+        """Reads and drops whatever the client sends until EOF, in bounded chunks."""
+        while await reader.read(4096):
+            pass
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        event = asyncio.Event()
+        self._clients.append(event)
+        last_sent: Optional[Tuple[float, ...]] = None
+        since_keyframe = 0
+        eof = asyncio.ensure_future(self._discard_input(reader))
+        try:
+            writer.write(encode_hello(self.hostname))
+            if self._sample is not None:
+                event.set()
+            while not writer.is_closing():
+                waiter = asyncio.ensure_future(event.wait())
+                await asyncio.wait({waiter, eof}, return_when=asyncio.FIRST_COMPLETED)
+                if eof.done():
+                    waiter.cancel()
+                    break
+                event.clear()
+                if writer.transport.get_write_buffer_size() > self.high_water:
+                    self.dropped += 1
+                    continue
+                timestamp, values = self._sample
+                if last_sent is None or since_keyframe >= self.keyframe_every:
+                    writer.write(encode_snapshot(timestamp, values))
+                    since_keyframe = 0
+                else:
+                    writer.write(encode_snapshot(timestamp, values, last_sent))
+                    since_keyframe += 1
+                last_sent = values
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            eof.cancel()
+            self._clients.remove(event)
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream system metrics to Smart Task Manager.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between samples")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    agent = MetricsAgent(interval=args.interval)
+    logging.info(f"Agent {agent.hostname} listening on {args.unix or f'{args.host}:{args.port}'}")
+    try:
+        asyncio.run(agent.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import asyncio
+import datetime
+import time
+import threading
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+from agent import DEFAULT_PORT, FRAME_HELLO, read_frame, decode_snapshot, unflatten_metrics
+
+
+def parse_endpoint(endpoint: str) -> Tuple[Optional[str], Optional[int], Optional[str]]:
+    """
+    Parses 'host:port', 'host', '[ipv6]:port', '[ipv6]' or 'unix:/path/to.sock'
+    into (host, port, unix_path). Raises ValueError for anything else.
+    """
+    endpoint = endpoint.strip()
+    if endpoint.startswith("unix:"):
+        path = endpoint[len("unix:"):].strip()
+        if not path:
+            raise ValueError("empty unix socket path")
+        return None, None, path
+    if endpoint.startswith("["):
+        host, sep, rest = endpoint[1:].partition("]")
+        if not sep or (rest and not rest.startswith(":")):
+            raise ValueError(f"malformed IPv6 endpoint: {endpoint}")
+        port = rest[1:] if rest else None
+    else:
+        if endpoint.count(":") > 1:
+            raise ValueError(f"IPv6 addresses must be bracketed, e.g. [::1]:{DEFAULT_PORT}")
+        host, sep, port = endpoint.partition(":")
+        port = port if sep else None
+    if not host:
+        raise ValueError(f"missing host in endpoint: {endpoint!r}")
+    port = DEFAULT_PORT if port is None else int(port)
+    if not 0 < port < 65536:
+        raise ValueError(f"port out of range: {port}")
+    return host, port, None
+
+
+class AgentAggregator:
+    """
+    Connects to many metrics agents from one asyncio loop running in a
+    background thread. Decoded snapshots are kept per endpoint; the GUI
+    only reads the latest one under a lock, so no socket work ever runs on
+    the GUI thread. A host whose last frame is older than `stale_after`
+    seconds is reported as stale rather than replaying its old snapshot.
+    """
+
+    def __init__(self, reconnect_delay: float = 2.0, stale_after: float = 3.0):
+        self.reconnect_delay = reconnect_delay
+        self.stale_after = stale_after
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="agent-aggregator", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        loop = self._loop
+        try:
+            asyncio.run_coroutine_threadsafe(self._cancel_all(), loop).result(timeout=2)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=2)
+        loop.close()
+        self._loop = None
+        self._thread = None
+
+    @staticmethod
+    async def _cancel_all():
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def add_agent(self, endpoint: str) -> bool:
+        endpoint = endpoint.strip()
+        try:
+            parse_endpoint(endpoint)
+        except ValueError:
+            logging.warning(f"Invalid agent endpoint: {endpoint}")
+            return False
+        with self._lock:
+            if endpoint in self._hosts:
+                return False
+            self._hosts[endpoint] = {"hostname": None, "metrics": None, "connected": False, "received_at": 0.0}
+        self.start()
+        asyncio.run_coroutine_threadsafe(self._follow(endpoint), self._loop)
+        return True
+
+    def endpoints(self) -> List[str]:
+        with self._lock:
+            return list(self._hosts)
+
+    def label(self, endpoint: str) -> str:
+        with self._lock:
+            host = self._hosts.get(endpoint)
+            if host is None:
+                return endpoint
+            name = host["hostname"] or endpoint
+            if not host["connected"]:
+                return f"{name} (offline)"
+            return f"{name} (stale)" if self._is_stale(host) else name
+
+    def latest(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            host = self._hosts.get(endpoint)
+            if host is None or not host["connected"] or self._is_stale(host):
+                return None
+            return host["metrics"]
+
+    def _is_stale(self, host: Dict[str, Any]) -> bool:
+        return time.monotonic() - host["received_at"] > self.stale_after
+
+    async def _follow(self, endpoint: str):
+        host, port, unix_path = parse_endpoint(endpoint)
+        while True:
+            try:
+                if unix_path:
+                    reader, writer = await asyncio.open_unix_connection(unix_path)
+                else:
+                    reader, writer = await asyncio.open_connection(host, port)
+            except OSError:
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+            try:
+                await self._consume(endpoint, reader)
+            except (asyncio.IncompleteReadError, ConnectionError, OSError, ValueError) as e:
+                logging.info(f"Agent {endpoint} disconnected: {e}")
+            finally:
+                writer.close()
+                with self._lock:
+                    self._hosts[endpoint]["connected"] = False
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _consume(self, endpoint: str, reader: asyncio.StreamReader):
+        values = None
+        while True:
+            frame_type, payload = await read_frame(reader)
+            if frame_type == FRAME_HELLO:
+                with self._lock:
+                    self._hosts[endpoint]["hostname"] = payload.decode("utf-8", "replace")
+                continue
+            timestamp, values = decode_snapshot(frame_type, payload, values)
+            metrics = unflatten_metrics(values)
+            metrics["timestamp"] = datetime.datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
+            with self._lock:
+                self._hosts[endpoint]["metrics"] = metrics
+                self._hosts[endpoint]["connected"] = True
+                self._hosts[endpoint]["received_at"] = time.monotonic()
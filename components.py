@@ -11,11 +11,15 @@ class TaskItemWidget(QFrame):
     deleted = Signal(str)
     toggled = Signal(str, bool)
     edited = Signal(str, str)
+    activated = Signal(str, bool)
+    bound = Signal(str, list)
 
-    def __init__(self, task_id: str, title: str, priority: str, completed: bool, dark_mode: bool = True, parent=None):
+    def __init__(self, task_id: str, title: str, priority: str, completed: bool, dark_mode: bool = True,
+                 due: str = None, recurrence: str = None, processes: list = None, parent=None):
         super().__init__(parent)
         self.task_id = task_id
         self.priority = priority
+        self.processes = list(processes or [])
         self.dark_mode = dark_mode
         self.setObjectName("glassCard")
         layout = QHBoxLayout(self)
@@ -29,9 +33,32 @@ class TaskItemWidget(QFrame):
         self.title_label = QLabel(title)
         
         self.priority_label = QLabel(priority.upper())
+        self.due_label = QLabel()
+        self.set_due(due, recurrence)
+        self.usage_label = QLabel()
+        self.set_usage(None)
+        
+        meta_layout = QHBoxLayout()
+        meta_layout.setSpacing(12)
+        meta_layout.addWidget(self.priority_label)
+        meta_layout.addWidget(self.due_label)
+        meta_layout.addWidget(self.usage_label)
+        meta_layout.addStretch()
         
         title_layout.addWidget(self.title_label)
-        title_layout.addWidget(self.priority_label)
+        title_layout.addLayout(meta_layout)
+        
+        self.active_btn = QPushButton("▶")
+        self.active_btn.setCheckable(True)
+        self.active_btn.setFixedSize(32, 32)
+        self.active_btn.setCursor(Qt.PointingHandCursor)
+        self.active_btn.setToolTip("Track resource usage of bound processes")
+        self.active_btn.toggled.connect(lambda checked: self.activated.emit(self.task_id, checked))
+        
+        self.bind_btn = QPushButton("⚙")
+        self.bind_btn.setFixedSize(32, 32)
+        self.bind_btn.setCursor(Qt.PointingHandCursor)
+        self.bind_btn.clicked.connect(self._on_bind)
         
         self.edit_btn = QPushButton("✎")
         self.edit_btn.setFixedSize(32, 32)
@@ -47,6 +74,8 @@ class TaskItemWidget(QFrame):
         layout.addWidget(self.checkbox)
         layout.addLayout(title_layout)
         layout.addStretch()
+        layout.addWidget(self.active_btn)
+        layout.addWidget(self.bind_btn)
         layout.addWidget(self.edit_btn)
         layout.addWidget(self.delete_btn)
         self._apply_internal_styles(completed)
@@ -57,6 +86,14 @@ class TaskItemWidget(QFrame):
         if ok and new_title.strip():
             self.edited.emit(self.task_id, new_title.strip())
 
+    def _on_bind(self):
+        from PySide6.QtWidgets import QInputDialog
+        current = ", ".join(str(p) for p in self.processes)
+        text, ok = QInputDialog.getText(self, "Bind Processes", "Process names or PIDs (comma-separated):", text=current)
+        if ok:
+            self.processes = [p.strip() for p in text.split(",") if p.strip()]
+            self.bound.emit(self.task_id, self.processes)
+
     def _apply_internal_styles(self, completed: bool):
         if completed:
             color = "#565F89" if self.dark_mode else "#90949C"
@@ -69,6 +106,32 @@ class TaskItemWidget(QFrame):
         light_colors = {"Low": "#28A745", "Medium": "#D39E00", "High": "#DC3545"}
         p_color = (dark_colors if self.dark_mode else light_colors).get(self.priority, "#7AA2F7")
         self.priority_label.setStyleSheet(f"font-size: 10px; font-weight: 900; color: {p_color}; letter-spacing: 0.5px;")
+        due_color = "#7AA2F7" if self.dark_mode else "#2563EB"
+        self.due_label.setStyleSheet(f"font-size: 10px; font-weight: 700; color: {due_color};")
+        self.usage_label.setStyleSheet(f"font-size: 10px; color: {due_color};")
+
+    def set_usage(self, summary: dict):
+        if not summary:
+            self.usage_label.setVisible(False)
+            return
+        self.usage_label.setText(f"CPU {summary['cpu_seconds']}s  |  AVG {summary['avg_mem_mb']}MB  |  PEAK {summary['peak_mem_mb']}MB")
+        self.usage_label.setVisible(True)
+
+    def set_active(self, active: bool):
+        self.active_btn.blockSignals(True)
+        self.active_btn.setChecked(active)
+        self.active_btn.blockSignals(False)
+
+    def set_due(self, due: str, recurrence: str = None):
+        if not due:
+            self.due_label.setText("")
+            self.due_label.setVisible(False)
+            return
+        text = "DUE " + due.replace("T", " ")[:16]
+        if recurrence:
+            text += f"  ↻ {recurrence.upper()}"
+        self.due_label.setText(text)
+        self.due_label.setVisible(True)
 
     def update_state(self, completed: bool, dark_mode: bool):
         self.dark_mode = dark_mode
@@ -118,6 +181,13 @@ class LiveMonitorChart(FigureCanvas):
         except Exception:
             pass
 
+    def reset(self):
+        self.data = np.zeros(len(self.data))
+        self.line.set_ydata(self.data)
+        self.fill.remove()
+        self.fill = self.axes.fill_between(range(len(self.data)), self.data, color=self.line_color, alpha=0.15)
+        self.draw_idle()
+
     def set_theme(self, dark_mode: bool):
         text_color = '#787C99' if dark_mode else '#4B4F56'
         grid_color = '#24283B' if dark_mode else '#E5E7EB'
@@ -147,3 +217,35 @@ class ProcessTable(QTableWidget):
                 item = QTableWidgetItem(str(val))
                 item.setTextAlignment(Qt.AlignCenter)
                 self.setItem(i, col, item)
+
+def format_bytes(size: float) -> str:
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+class DiskUsageTable(QTableWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setColumnCount(3)
+        self.setHorizontalHeaderLabels(["DIRECTORY", "SIZE", "SHARE %"])
+        self.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        self.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        self.horizontalHeader().setStyleSheet("font-weight: bold; text-transform: uppercase; font-size: 10px;")
+        self.setSelectionBehavior(QTableWidget.SelectRows)
+        self.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.setShowGrid(False)
+        self.verticalHeader().setVisible(False)
+        self.setAlternatingRowColors(True)
+        self.setStyleSheet("QTableWidget { border: none; background: transparent; }")
+
+    def update_usage(self, largest, total_bytes):
+        self.setRowCount(len(largest))
+        for i, (path, size) in enumerate(largest):
+            share = round(size / total_bytes * 100, 1) if total_bytes else 0.0
+            for col, val in enumerate([path, format_bytes(size), share]):
+                item = QTableWidgetItem(str(val))
+                item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter if col == 0 else Qt.AlignCenter)
+                self.setItem(i, col, item)
@@ -53,3 +53,15 @@ class DataManager:
                 tasks[i].update(updated_task)
                 break
         self.save_tasks(tasks)
+
+    def update_tasks(self, updated_tasks: List[Dict[str, Any]]):
+        """Merges several partial task updates with a single load and save."""
+        if not updated_tasks:
+            return
+        updates = {u.get('id'): u for u in updated_tasks}
+        tasks = self.load_tasks()
+        for task in tasks:
+            update = updates.get(task.get('id'))
+            if update is not None:
+                task.update(update)
+        self.save_tasks(tasks)
@@ -0,0 +1,202 @@
+import os
+import heapq
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    files INTEGER NOT NULL,
+    subdirs TEXT NOT NULL
+)
+"""
+
+
+def _scan_dir(path: str, cached: Optional[Tuple[int, int, int, str]], root_dev: int):
+    """Lists one directory, or reuses the cached listing if its mtime is unchanged."""
+    try:
+        st = os.stat(path, follow_symlinks=False)
+    except OSError:
+        return None
+    if st.st_dev != root_dev:
+        return None
+    if cached is not None and cached[0] == st.st_mtime_ns:
+        return st.st_mtime_ns, cached[1], cached[2], cached[3], True
+
+    total = files = 0
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+                        files += 1
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return st.st_mtime_ns, total, files, "\0".join(subdirs), False
+
+
+class DiskUsageAnalyzer:
+    """
+    Scans a directory tree with os.scandir across a thread pool. Only
+    per-directory aggregates are kept, and directories deeper than
+    `track_depth` roll up into their ancestor, so memory is bounded by the
+    number of shallow directories rather than the number of files.
+
+    Listings are cached in SQLite keyed by directory mtime; a rescan only
+    lists directories whose entries changed. Files grown in place don't
+    bump their directory's mtime, so use full=True to refresh those.
+    """
+
+    def __init__(self, cache_path: str = "disk_cache.db", workers: int = 8,
+                 track_depth: int = 4, top_n: int = 200):
+        self.cache_path = cache_path
+        self.workers = workers
+        self.track_depth = track_depth
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._reset(None)
+
+    def _reset(self, root: Optional[str]):
+        self._root = root
+        self._totals: Dict[str, int] = {}
+        self._files = 0
+        self._scanned = 0
+        self._reused = 0
+        self._done = False
+        self._cancelled = False
+        self.version = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, root: str, full: bool = False) -> bool:
+        if self.running:
+            return False
+        root = os.path.abspath(os.path.expanduser(root))
+        if not os.path.isdir(root):
+            logging.warning(f"Disk scan skipped, not a directory: {root}")
+            return False
+        self._cancel.clear()
+        with self._lock:
+            self._reset(root)
+        self._thread = threading.Thread(target=self._run, args=(root, full), name="disk-analyzer", daemon=True)
+        self._thread.start()
+        return True
+
+    def cancel(self):
+        self._cancel.set()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            largest = heapq.nlargest(self.top_n, self._totals.items(), key=lambda kv: kv[1])
+            return {
+                "root": self._root,
+                "total_bytes": self._totals.get(self._root, 0),
+                "files": self._files,
+                "scanned_dirs": self._scanned,
+                "reused_dirs": self._reused,
+                "largest": largest,
+                "done": self._done,
+                "cancelled": self._cancelled,
+                "version": self.version,
+            }
+
+    def _run(self, root: str, full: bool):
+        try:
+            conn = sqlite3.connect(self.cache_path)
+            conn.execute(_SCHEMA)
+        except sqlite3.Error as e:
+            logging.error(f"Disk cache unavailable, scanning without it: {e}")
+            conn = None
+        try:
+            self._walk(root, full, conn)
+        except Exception as e:
+            logging.error(f"Disk scan failed: {e}")
+        finally:
+            if conn is not None:
+                conn.commit()
+                conn.close()
+            with self._lock:
+                self._cancelled = self._cancel.is_set()
+                self._done = True
+                self.version += 1
+
+    def _walk(self, root: str, full: bool, conn: Optional[sqlite3.Connection]):
+        root_dev = os.stat(root).st_dev
+        # Depth-first stack keeps the pending frontier small on wide trees
+        stack: List[Tuple[str, int, str]] = [(root, 0, root)]
+        pending = {}
+        max_in_flight = self.workers * 4
+        writes = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while (stack or pending) and not self._cancel.is_set():
+                while stack and len(pending) < max_in_flight:
+                    path, depth, bucket = stack.pop()
+                    cached = None
+                    if conn is not None:
+                        cached = conn.execute("SELECT mtime, bytes, files, subdirs FROM dirs WHERE path = ?",
+                                              (path,)).fetchone()
+                    future = pool.submit(_scan_dir, path, None if full else cached, root_dev)
+                    pending[future] = (path, depth, bucket, cached[3] if cached else None)
+
+                finished, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    path, depth, bucket, old_subdirs = pending.pop(future)
+                    result = future.result()
+                    if result is None:
+                        continue
+                    mtime, size, files, subdirs, reused = result
+                    if conn is not None and not reused:
+                        conn.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?)",
+                                     (path, mtime, size, files, subdirs))
+                        if old_subdirs:
+                            self._prune(conn, path, set(old_subdirs.split("\0")) - set(subdirs.split("\0")))
+                        writes += 1
+                        if writes % 1000 == 0:
+                            conn.commit()
+                    self._account(root, bucket, size, files, reused)
+                    for name in subdirs.split("\0") if subdirs else ():
+                        child = os.path.join(path, name)
+                        stack.append((child, depth + 1, child if depth + 1 <= self.track_depth else bucket))
+
+            if self._cancel.is_set():
+                for future in pending:
+                    future.cancel()
+
+    @staticmethod
+    def _prune(conn: sqlite3.Connection, parent: str, removed_names):
+        """Deletes cached rows for subdirectories that vanished from `parent`, including their subtrees."""
+        for name in removed_names:
+            child = os.path.join(parent, name)
+            prefix = os.path.join(child, "")
+            # Every path under `prefix` sorts below the same prefix with its separator bumped by one
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            conn.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (child, prefix, upper))
+
+    def _account(self, root: str, bucket: str, size: int, files: int, reused: bool):
+        with self._lock:
+            path = bucket
+            while True:
+                self._totals[path] = self._totals.get(path, 0) + size
+                if path == root:
+                    break
+                path = os.path.dirname(path)
+            self._files += files
+            self._scanned += 1
+            self._reused += reused
+            self.version += 1
@@ -0,0 +1,176 @@
+import json
+import socket
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+JSON_CONTENT_TYPE = "application/json"
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus(metrics: Dict[str, Any], processes: List[Dict[str, Any]]) -> bytes:
+    lines = []
+
+    def gauge(name: str, help_text: str, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in samples:
+            label_str = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+            lines.append(f"{name}{{{label_str}}} {value}" if label_str else f"{name} {value}")
+
+    memory = metrics.get("memory", {})
+    disk = metrics.get("disk", {})
+    network = metrics.get("network", {})
+    gauge("smart_task_cpu_percent", "System-wide CPU utilisation.", [({}, metrics.get("cpu", 0.0))])
+    gauge("smart_task_memory_gigabytes", "Physical memory in GiB.",
+          [({"kind": "total"}, memory.get("total", 0.0)), ({"kind": "available"}, memory.get("available", 0.0))])
+    gauge("smart_task_memory_percent", "Physical memory in use.", [({}, memory.get("percent", 0.0))])
+    gauge("smart_task_disk_gigabytes", "Root filesystem size in GiB.",
+          [({"kind": k}, disk.get(k, 0.0)) for k in ("total", "used", "free")])
+    gauge("smart_task_disk_percent", "Root filesystem usage.", [({}, disk.get("percent", 0.0))])
+    gauge("smart_task_network_kilobytes_per_second", "Network throughput.",
+          [({"direction": "sent"}, network.get("sent", 0.0)), ({"direction": "recv"}, network.get("recv", 0.0))])
+    gauge("smart_task_process_cpu_percent", "Per-process CPU utilisation.",
+          [({"pid": p["pid"], "name": p["name"]}, p["cpu_percent"]) for p in processes])
+    gauge("smart_task_process_memory_percent", "Per-process memory usage.",
+          [({"pid": p["pid"], "name": p["name"]}, p["memory_percent"]) for p in processes])
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def render_json(metrics: Dict[str, Any], processes: List[Dict[str, Any]]) -> bytes:
+    return json.dumps({"metrics": metrics, "processes": processes}, ensure_ascii=False).encode("utf-8")
+
+
+class _ExporterHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; don't let Nagle stall keep-alive scrapes
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.server.stopped:
+            # A keep-alive connection that outlived stop(); refuse and hang up
+            self.close_connection = True
+            self.send_error(503)
+            return
+        # Grab the current buffers once; publish() swaps the whole dict atomically
+        buffers = self.server.buffers
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body, content_type = buffers["prometheus"], PROMETHEUS_CONTENT_TYPE
+        elif path in ("/metrics.json", "/json"):
+            body, content_type = buffers["json"], JSON_CONTENT_TYPE
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ExporterServer(ThreadingHTTPServer):
+    """Tracks open client sockets so stop() can hang up keep-alive scrapers."""
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stopped = False
+        self.buffers = {}
+        self.connections = set()
+        self._connections_lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._connections_lock:
+            self.connections.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request):
+        with self._connections_lock:
+            self.connections.discard(request)
+        super().shutdown_request(request)
+
+    def handle_error(self, request, client_address):
+        # Sockets torn down by close_connections() are expected to error out
+        if not self.stopped:
+            super().handle_error(request, client_address)
+
+    def close_connections(self):
+        with self._connections_lock:
+            connections = list(self.connections)
+        for request in connections:
+            try:
+                request.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class MetricsExporter:
+    """
+    Localhost HTTP endpoint serving the latest published snapshot as
+    Prometheus text (/metrics) or JSON (/metrics.json). Snapshots are
+    rendered once in publish(); request handlers only copy bytes out.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9464):
+        self.host = host
+        self.port = port
+        self._server: Optional[_ExporterServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._metrics: Dict[str, Any] = {}
+        self._processes: List[Dict[str, Any]] = []
+        self._buffers = {"prometheus": render_prometheus({}, []), "json": render_json({}, [])}
+
+    @property
+    def running(self) -> bool:
+        return self._server is not None
+
+    @property
+    def address(self):
+        return self._server.server_address if self._server else (self.host, self.port)
+
+    def start(self) -> bool:
+        if self._server is not None:
+            return True
+        try:
+            server = _ExporterServer((self.host, self.port), _ExporterHandler)
+        except OSError as e:
+            logging.error(f"Could not start metrics exporter on {self.host}:{self.port}: {e}")
+            return False
+        server.buffers = self._buffers
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True)
+        self._thread.start()
+        logging.info(f"Metrics exporter listening on http://{self.host}:{server.server_address[1]}/metrics")
+        return True
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.stopped = True
+        self._server.shutdown()
+        self._server.server_close()
+        self._server.close_connections()
+        self._thread.join(timeout=2)
+        self._server = None
+        self._thread = None
+
+    def publish(self, metrics: Optional[Dict[str, Any]] = None, processes: Optional[List[Dict[str, Any]]] = None):
+        if metrics is not None:
+            self._metrics = metrics
+        if processes is not None:
+            self._processes = processes
+        self._buffers = {
+            "prometheus": render_prometheus(self._metrics, self._processes),
+            "json": render_json(self._metrics, self._processes),
+        }
+        if self._server is not None:
+            self._server.buffers = self._buffers
@@ -1,15 +1,24 @@
+import os
 import uuid
 import sys
+import time
+import datetime
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QLineEdit, QPushButton, QComboBox, 
                              QListWidget, QListWidgetItem, QStackedWidget, QFrame,
-                             QSystemTrayIcon, QMenu, QApplication, QStyle, QGraphicsDropShadowEffect)
+                             QSystemTrayIcon, QMenu, QApplication, QStyle, QGraphicsDropShadowEffect,
+                             QCheckBox, QDateTimeEdit, QSlider, QInputDialog)
 from PySide6.QtGui import QIcon, QAction, QColor, QMouseEvent
-from PySide6.QtCore import QTimer, Qt, QPropertyAnimation, QEasingCurve, QPoint
+from PySide6.QtCore import QTimer, Qt, QPropertyAnimation, QEasingCurve, QPoint, QDateTime
 from data_manager import DataManager
-from system_monitor import SystemMonitor
+from system_monitor import SystemMonitor, ProcessSampler
 from styles import StyleManager
-from components import TaskItemWidget, LiveMonitorChart, ProcessTable
+from exporter import MetricsExporter
+from aggregator import AgentAggregator
+from disk_analyzer import DiskUsageAnalyzer
+from recorder import ProcessRecorder
+from scheduler import ReminderScheduler, RECURRENCE_RULES, parse_due, format_due, next_occurrence
+from components import TaskItemWidget, LiveMonitorChart, ProcessTable, DiskUsageTable, format_bytes
 
 class SmartTaskManagerUI(QMainWindow):
     def __init__(self):
@@ -23,9 +32,27 @@ class SmartTaskManagerUI(QMainWindow):
         
         self.data_manager = DataManager()
         self.system_monitor = SystemMonitor()
+        self.system_monitor.recorder = ProcessRecorder()
+        # Full process scans run on the sampler thread; the GUI only reads results
+        self.process_sampler = ProcessSampler(self.system_monitor)
+        self.replay_time = None
         self.dark_mode = True
         self.proc_update_counter = 0
         self._drag_pos = QPoint()
+        self.scheduler = ReminderScheduler()
+        self._tasks_by_id = {}
+        self._task_widgets = {}
+        self.active_task_id = None
+        self.usage_save_counter = 0
+        self.exporter = MetricsExporter()
+        self.disk_analyzer = DiskUsageAnalyzer()
+        self.disk_view_version = -1
+        self.aggregator = AgentAggregator()
+        
+        # Only the earliest reminder is ever armed; it re-arms itself after firing
+        self.reminder_timer = QTimer(self)
+        self.reminder_timer.setSingleShot(True)
+        self.reminder_timer.timeout.connect(self._fire_reminders)
         
         self._init_ui()
         self._setup_tray()
@@ -39,6 +66,8 @@ class SmartTaskManagerUI(QMainWindow):
         self.timer = QTimer()
         self.timer.timeout.connect(self._update_all)
         self.timer.start(1000)
+        self.process_sampler.start()
+        QApplication.instance().aboutToQuit.connect(self._on_quit)
 
     def _init_ui(self):
         # Main background container for transparency
@@ -92,7 +121,7 @@ class SmartTaskManagerUI(QMainWindow):
         
         # Navigation Buttons
         self.nav_btns = []
-        menus = [("TASKS", 0), ("MONITOR", 1), ("PROCESSES", 2)]
+        menus = [("TASKS", 0), ("MONITOR", 1), ("PROCESSES", 2), ("DISK", 3)]
         for text, index in menus:
             btn = QPushButton(text)
             btn.setObjectName("navButton")
@@ -104,6 +133,12 @@ class SmartTaskManagerUI(QMainWindow):
             
         self.sidebar_layout.addStretch()
         
+        self.exporter_btn = QPushButton("Exporter: Off")
+        self.exporter_btn.setObjectName("navButton")
+        self.exporter_btn.setToolTip(f"Serve metrics on http://{self.exporter.host}:{self.exporter.port}/metrics")
+        self.exporter_btn.clicked.connect(self._toggle_exporter)
+        self.sidebar_layout.addWidget(self.exporter_btn)
+        
         self.theme_btn = QPushButton("Toggle Theme")
         self.theme_btn.setObjectName("navButton")
         self.theme_btn.clicked.connect(self._toggle_theme)
@@ -118,6 +153,12 @@ class SmartTaskManagerUI(QMainWindow):
         self._setup_task_page()
         self._setup_monitor_page()
         self._setup_process_page()
+        self._setup_disk_page()
+        
+        # Agents listed as "host:port" or "unix:/path", comma-separated
+        for endpoint in os.environ.get("SMART_TASK_AGENTS", "").split(","):
+            if endpoint.strip():
+                self._add_agent(endpoint)
         
         self.outer_layout.addWidget(self.content_container)
 
@@ -138,12 +179,27 @@ class SmartTaskManagerUI(QMainWindow):
         self.priority_combo.addItems(["Low", "Medium", "High"])
         self.priority_combo.setFixedWidth(130)
         
+        self.due_check = QCheckBox("DUE")
+        self.due_edit = QDateTimeEdit(QDateTime.currentDateTime().addSecs(3600))
+        self.due_edit.setDisplayFormat("yyyy-MM-dd HH:mm")
+        self.due_edit.setCalendarPopup(True)
+        self.due_edit.setEnabled(False)
+        self.recurrence_combo = QComboBox()
+        self.recurrence_combo.addItems(["Once"] + list(RECURRENCE_RULES))
+        self.recurrence_combo.setFixedWidth(110)
+        self.recurrence_combo.setEnabled(False)
+        self.due_check.toggled.connect(self.due_edit.setEnabled)
+        self.due_check.toggled.connect(self.recurrence_combo.setEnabled)
+        
         self.add_btn = QPushButton("ADD TASK")
         self.add_btn.setObjectName("actionButton")
         self.add_btn.clicked.connect(self._add_task)
         
         input_layout.addWidget(self.task_input)
         input_layout.addWidget(self.priority_combo)
+        input_layout.addWidget(self.due_check)
+        input_layout.addWidget(self.due_edit)
+        input_layout.addWidget(self.recurrence_combo)
         input_layout.addWidget(self.add_btn)
         layout.addWidget(input_frame)
         
@@ -158,6 +214,19 @@ class SmartTaskManagerUI(QMainWindow):
         layout = QVBoxLayout(page)
         layout.setContentsMargins(30, 30, 30, 30)
         
+        host_layout = QHBoxLayout()
+        self.host_combo = QComboBox()
+        self.host_combo.addItem("Local", None)
+        self.host_combo.setMinimumWidth(220)
+        self.host_combo.currentIndexChanged.connect(self._switch_host)
+        self.add_agent_btn = QPushButton("ADD AGENT")
+        self.add_agent_btn.setObjectName("actionButton")
+        self.add_agent_btn.clicked.connect(self._prompt_add_agent)
+        host_layout.addWidget(self.host_combo)
+        host_layout.addWidget(self.add_agent_btn)
+        host_layout.addStretch()
+        layout.addLayout(host_layout)
+        
         grid = QHBoxLayout()
         self.cpu_chart = LiveMonitorChart(title="CPU PERFORMANCE (%)", color="#7AA2F7")
         self.ram_chart = LiveMonitorChart(title="MEMORY ALLOCATION (%)", color="#BB9AF7")
@@ -190,6 +259,64 @@ class SmartTaskManagerUI(QMainWindow):
         table_layout.addWidget(self.proc_table)
         layout.addWidget(table_frame)
         
+        timeline_frame = QFrame()
+        timeline_frame.setObjectName("glassCard")
+        timeline_layout = QHBoxLayout(timeline_frame)
+        timeline_layout.setContentsMargins(15, 10, 15, 10)
+        self.timeline_slider = QSlider(Qt.Horizontal)
+        self.timeline_slider.setRange(0, 0)
+        self.timeline_slider.valueChanged.connect(self._scrub_timeline)
+        self.timeline_label = QLabel("LIVE")
+        self.timeline_label.setFixedWidth(140)
+        self.timeline_label.setStyleSheet("font-family: 'Consolas'; font-size: 11px; color: #565F89;")
+        self.live_btn = QPushButton("LIVE")
+        self.live_btn.setObjectName("actionButton")
+        self.live_btn.clicked.connect(self._resume_live)
+        timeline_layout.addWidget(self.timeline_slider)
+        timeline_layout.addWidget(self.timeline_label)
+        timeline_layout.addWidget(self.live_btn)
+        layout.addWidget(timeline_frame)
+        
+        self.stack.addWidget(page)
+
+    def _setup_disk_page(self):
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(30, 30, 30, 30)
+        
+        input_frame = QFrame()
+        input_frame.setObjectName("glassCard")
+        input_layout = QHBoxLayout(input_frame)
+        input_layout.setContentsMargins(15, 15, 15, 15)
+        
+        self.disk_path_input = QLineEdit(os.path.expanduser("~"))
+        self.disk_path_input.setPlaceholderText("Directory to analyze...")
+        self.disk_full_check = QCheckBox("FULL RESCAN")
+        self.disk_scan_btn = QPushButton("SCAN")
+        self.disk_scan_btn.setObjectName("actionButton")
+        self.disk_scan_btn.clicked.connect(self._start_disk_scan)
+        self.disk_cancel_btn = QPushButton("CANCEL")
+        self.disk_cancel_btn.setObjectName("dangerButton")
+        self.disk_cancel_btn.setEnabled(False)
+        self.disk_cancel_btn.clicked.connect(self.disk_analyzer.cancel)
+        
+        input_layout.addWidget(self.disk_path_input)
+        input_layout.addWidget(self.disk_full_check)
+        input_layout.addWidget(self.disk_scan_btn)
+        input_layout.addWidget(self.disk_cancel_btn)
+        layout.addWidget(input_frame)
+        
+        table_frame = QFrame()
+        table_frame.setObjectName("glassCard")
+        table_layout = QVBoxLayout(table_frame)
+        self.disk_table = DiskUsageTable()
+        table_layout.addWidget(self.disk_table)
+        layout.addWidget(table_frame)
+        
+        self.disk_status_label = QLabel("Select a directory and press SCAN.")
+        self.disk_status_label.setStyleSheet("font-family: 'Consolas'; font-size: 11px; color: #565F89;")
+        layout.addWidget(self.disk_status_label)
+        
         self.stack.addWidget(page)
 
     def _apply_shadow(self):
@@ -256,27 +383,55 @@ class SmartTaskManagerUI(QMainWindow):
         title = self.task_input.text().strip()
         if not title: return
         task = {"id": str(uuid.uuid4()), "title": title, "priority": self.priority_combo.currentText(), "completed": False}
+        if self.due_check.isChecked():
+            task["due"] = format_due(self.due_edit.dateTime().toPython().replace(second=0, microsecond=0))
+            recurrence = self.recurrence_combo.currentText()
+            task["recurrence"] = recurrence if recurrence in RECURRENCE_RULES else None
         self.data_manager.add_task(task)
         self._add_task_widget(task)
+        self._schedule_task(task)
+        self._arm_reminder_timer()
         self.task_input.clear()
 
     def _add_task_widget(self, task):
         item = QListWidgetItem(self.task_list)
-        widget = TaskItemWidget(task['id'], task['title'], task['priority'], task['completed'], self.dark_mode)
+        self._tasks_by_id[task['id']] = task
+        widget = TaskItemWidget(task['id'], task['title'], task['priority'], task['completed'], self.dark_mode,
+                                due=task.get('due'), recurrence=task.get('recurrence'),
+                                processes=task.get('processes'))
+        self._task_widgets[task['id']] = widget
         widget.deleted.connect(self._delete_task)
         widget.toggled.connect(self._toggle_task_status)
         widget.edited.connect(self._edit_task)
+        widget.activated.connect(self._activate_task)
+        widget.bound.connect(self._bind_task)
+        if task.get('processes'):
+            self.system_monitor.bind_task(task['id'], task['processes'])
+        if task.get('usage'):
+            self.system_monitor.set_task_usage(task['id'], task['usage'])
+            widget.set_usage(SystemMonitor.summarize_usage(task['usage']))
         item.setSizeHint(widget.sizeHint())
         self.task_list.addItem(item)
         self.task_list.setItemWidget(item, widget)
 
     def _load_tasks_into_list(self):
         self.task_list.clear()
+        self._task_widgets.clear()
         for task in self.data_manager.load_tasks():
             self._add_task_widget(task)
+            self._schedule_task(task)
+        self._arm_reminder_timer()
 
     def _delete_task(self, task_id):
         self.data_manager.delete_task(task_id)
+        self._tasks_by_id.pop(task_id, None)
+        self._task_widgets.pop(task_id, None)
+        if task_id == self.active_task_id:
+            self.active_task_id = None
+        self.system_monitor.unbind_task(task_id)
+        self.system_monitor.set_task_usage(task_id, None)
+        self.scheduler.cancel(task_id)
+        self._arm_reminder_timer()
         for i in range(self.task_list.count()):
             item = self.task_list.item(i)
             widget = self.task_list.itemWidget(item)
@@ -286,36 +441,241 @@ class SmartTaskManagerUI(QMainWindow):
 
     def _toggle_task_status(self, task_id, completed):
         self.data_manager.update_task({"id": task_id, "completed": completed})
-        for i in range(self.task_list.count()):
-            widget = self.task_list.itemWidget(self.task_list.item(i))
-            if widget and widget.task_id == task_id:
-                widget.update_state(completed, self.dark_mode)
-                break
+        task = self._tasks_by_id.get(task_id)
+        if task is not None:
+            task["completed"] = completed
+            self._schedule_task(task)
+            self._arm_reminder_timer()
+        widget = self._find_task_widget(task_id)
+        if widget:
+            widget.update_state(completed, self.dark_mode)
 
     def _edit_task(self, task_id, new_title):
         self.data_manager.update_task({"id": task_id, "title": new_title})
-        for i in range(self.task_list.count()):
-            widget = self.task_list.itemWidget(self.task_list.item(i))
-            if widget and widget.task_id == task_id:
-                widget.title_label.setText(new_title)
-                break
+        if task_id in self._tasks_by_id:
+            self._tasks_by_id[task_id]["title"] = new_title
+        widget = self._find_task_widget(task_id)
+        if widget:
+            widget.title_label.setText(new_title)
+
+    def _activate_task(self, task_id, active):
+        previous = self.active_task_id
+        if previous is not None:
+            self._save_task_usage(previous)
+            if previous != task_id:
+                widget = self._find_task_widget(previous)
+                if widget:
+                    widget.set_active(False)
+        self.active_task_id = task_id if active else None
+        self.system_monitor.set_active_task(self.active_task_id)
+
+    def _bind_task(self, task_id, processes):
+        self.data_manager.update_task({"id": task_id, "processes": processes})
+        if task_id in self._tasks_by_id:
+            self._tasks_by_id[task_id]["processes"] = processes
+        if processes:
+            self.system_monitor.bind_task(task_id, processes)
+        else:
+            self.system_monitor.unbind_task(task_id)
+
+    def _save_task_usage(self, task_id):
+        usage = self.system_monitor.get_task_usage(task_id)
+        if usage is None:
+            return
+        snapshot = {k: round(v, 3) for k, v in usage.items()}
+        self.data_manager.update_task({"id": task_id, "usage": snapshot})
+        if task_id in self._tasks_by_id:
+            self._tasks_by_id[task_id]["usage"] = snapshot
+
+    def _update_task_usage(self):
+        if self.active_task_id is None:
+            return
+        usage = self.process_sampler.latest_usage(self.active_task_id)
+        if usage is None:
+            return
+        widget = self._find_task_widget(self.active_task_id)
+        if widget:
+            widget.set_usage(SystemMonitor.summarize_usage(usage))
+        # Persist the running totals periodically rather than every sample
+        self.usage_save_counter += 1
+        if self.usage_save_counter >= 30:
+            self._save_task_usage(self.active_task_id)
+            self.usage_save_counter = 0
+
+    def _find_task_widget(self, task_id):
+        return self._task_widgets.get(task_id)
+
+    def _schedule_task(self, task):
+        due = parse_due(task.get("due"))
+        if due is None or task.get("completed") or task.get("reminded"):
+            self.scheduler.cancel(task["id"])
+            return
+        self.scheduler.schedule(task["id"], due.timestamp())
+
+    def _arm_reminder_timer(self):
+        next_fire = self.scheduler.next_fire_time()
+        if next_fire is None:
+            self.reminder_timer.stop()
+            return
+        # QTimer intervals are 32-bit ms; far-off reminders just wake up early and re-arm
+        delay_ms = int(max(0.0, next_fire - time.time()) * 1000)
+        self.reminder_timer.start(min(delay_ms, 24 * 3600 * 1000))
+
+    def _fire_reminders(self):
+        now = datetime.datetime.now().replace(microsecond=0)
+        fired = []
+        updates = []
+        for task_id in self.scheduler.pop_due(now.timestamp()):
+            task = self._tasks_by_id.get(task_id)
+            if task is None:
+                continue
+            fired.append(task)
+            following = next_occurrence(parse_due(task["due"]), task.get("recurrence"), now)
+            if following is not None:
+                task["due"] = format_due(following)
+                updates.append({"id": task_id, "due": task["due"]})
+                widget = self._find_task_widget(task_id)
+                if widget:
+                    widget.set_due(task["due"], task.get("recurrence"))
+            else:
+                task["reminded"] = True
+                updates.append({"id": task_id, "reminded": True})
+            self._schedule_task(task)
+        # One save per batch no matter how many reminders shared the deadline
+        self.data_manager.update_tasks(updates)
+        if len(fired) == 1:
+            self.tray_icon.showMessage("Task Reminder", f"{fired[0]['title']} ({fired[0]['priority']})",
+                                       QSystemTrayIcon.Information, 10000)
+        elif fired:
+            titles = ", ".join(t['title'] for t in fired[:3])
+            more = f" and {len(fired) - 3} more" if len(fired) > 3 else ""
+            self.tray_icon.showMessage("Task Reminders", f"{len(fired)} tasks due: {titles}{more}",
+                                       QSystemTrayIcon.Information, 10000)
+        self._arm_reminder_timer()
 
     def _update_all(self):
         self._update_system_metrics()
+        self._update_task_usage()
+        processes = self.process_sampler.latest_processes()
+        self.proc_update_counter += 1
+        if self.proc_update_counter >= 3:
+            if self.stack.currentIndex() == 2 and self.replay_time is None:
+                self.proc_table.update_processes(processes)
+            if self.exporter.running:
+                self.exporter.publish(processes=processes)
+            self.proc_update_counter = 0
         if self.stack.currentIndex() == 2:
-            self.proc_update_counter += 1
-            if self.proc_update_counter >= 3:
-                self.proc_table.update_processes(self.system_monitor.get_processes())
-                self.proc_update_counter = 0
+            self._update_timeline()
+        if self.stack.currentIndex() == 3:
+            self._update_disk_view()
+
+    def _start_disk_scan(self):
+        if self.disk_analyzer.start(self.disk_path_input.text().strip(), full=self.disk_full_check.isChecked()):
+            self.disk_scan_btn.setEnabled(False)
+            self.disk_cancel_btn.setEnabled(True)
+            self.disk_view_version = -1
+            self._update_disk_view()
+
+    def _update_disk_view(self):
+        snapshot = self.disk_analyzer.snapshot()
+        if snapshot["root"] is None or snapshot["version"] == self.disk_view_version:
+            return
+        self.disk_view_version = snapshot["version"]
+        self.disk_table.update_usage(snapshot["largest"], snapshot["total_bytes"])
+        if snapshot["done"]:
+            state = "CANCELLED" if snapshot["cancelled"] else "DONE"
+            self.disk_scan_btn.setEnabled(True)
+            self.disk_cancel_btn.setEnabled(False)
+        else:
+            state = "SCANNING"
+        self.disk_status_label.setText(
+            f"{state}  |  {format_bytes(snapshot['total_bytes'])} in {snapshot['files']} files  |  "
+            f"{snapshot['scanned_dirs']} dirs ({snapshot['reused_dirs']} from cache)")
+
+    def _update_timeline(self):
+        recorder = self.system_monitor.recorder
+        if not len(recorder):
+            return
+        self.timeline_slider.blockSignals(True)
+        self.timeline_slider.setRange(0, len(recorder) - 1)
+        if self.replay_time is None:
+            self.timeline_slider.setValue(len(recorder) - 1)
+        else:
+            # Old frames expire from the front, so track the replay instant by time
+            self.timeline_slider.setValue(max(0, recorder.index_at(self.replay_time)))
+        self.timeline_slider.blockSignals(False)
+
+    def _scrub_timeline(self, index):
+        recorder = self.system_monitor.recorder
+        if index >= len(recorder) - 1:
+            self._resume_live()
+            return
+        self.replay_time = recorder.time_at(index)
+        # Look up by time: the sampler thread may expire frames between calls
+        snapshot = sorted(recorder.snapshot_at(self.replay_time), key=lambda x: x['cpu_percent'], reverse=True)[:50]
+        self.proc_table.update_processes(snapshot)
+        self.timeline_label.setText(datetime.datetime.fromtimestamp(self.replay_time).strftime("REPLAY %H:%M:%S"))
+
+    def _resume_live(self):
+        self.replay_time = None
+        self.timeline_label.setText("LIVE")
+        recorder = self.system_monitor.recorder
+        latest = recorder.snapshot(len(recorder) - 1)
+        self.proc_table.update_processes(sorted(latest, key=lambda x: x['cpu_percent'], reverse=True)[:50])
+        self._update_timeline()
 
     def _update_system_metrics(self):
         metrics = self.system_monitor.get_all_metrics()
+        if self.exporter.running:
+            self.exporter.publish(metrics=metrics)
+        self._refresh_host_labels()
+        endpoint = self.host_combo.currentData()
+        if endpoint is not None:
+            metrics = self.aggregator.latest(endpoint)
+            if metrics is None:
+                self.metrics_label.setText(f"NO CURRENT DATA FROM {self.aggregator.label(endpoint)}")
+                return
         self.cpu_chart.update_data(metrics['cpu'])
         self.ram_chart.update_data(metrics['memory']['percent'])
         self.net_up_chart.update_data(metrics['network']['sent'], max_val=200)
         self.net_down_chart.update_data(metrics['network']['recv'], max_val=500)
         self.metrics_label.setText(f"CPU CORE: {metrics['cpu']}%  |  MEM USED: {metrics['memory']['percent']}%  |  NET UP: {metrics['network']['sent']}KB/s")
 
+    def _prompt_add_agent(self):
+        endpoint, ok = QInputDialog.getText(self, "Add Agent", "Agent address (host:port or unix:/path):")
+        if ok and endpoint.strip():
+            self._add_agent(endpoint)
+
+    def _add_agent(self, endpoint):
+        endpoint = endpoint.strip()
+        if self.aggregator.add_agent(endpoint):
+            self.host_combo.addItem(endpoint, endpoint)
+
+    def _refresh_host_labels(self):
+        for i in range(1, self.host_combo.count()):
+            label = self.aggregator.label(self.host_combo.itemData(i))
+            if self.host_combo.itemText(i) != label:
+                self.host_combo.setItemText(i, label)
+
+    def _switch_host(self, index):
+        for chart in [self.cpu_chart, self.ram_chart, self.net_up_chart, self.net_down_chart]:
+            chart.reset()
+
+    def _toggle_exporter(self):
+        if self.exporter.running:
+            self.exporter.stop()
+        else:
+            self.exporter.start()
+        self.exporter_btn.setText("Exporter: On" if self.exporter.running else "Exporter: Off")
+
+    def _on_quit(self):
+        self.process_sampler.stop()
+        self.exporter.stop()
+        self.disk_analyzer.cancel()
+        self.aggregator.stop()
+        if self.active_task_id is not None:
+            self._save_task_usage(self.active_task_id)
+
     def closeEvent(self, event):
         if self.tray_icon.isVisible():
             self.hide()
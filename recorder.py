@@ -0,0 +1,139 @@
+import struct
+import time
+import threading
+from array import array
+from bisect import bisect_right
+from typing import Dict, Any, List, Optional, Tuple
+
+# Frame layout: header, then `changed` entries, then `removed` PIDs
+_HEADER = struct.Struct("<dBII")      # timestamp, is_keyframe, changed, removed
+_ENTRY = struct.Struct("<IIHH")       # pid, name index, cpu tenths, mem tenths
+_PID = struct.Struct("<I")
+
+_MAX_TENTHS = 0xFFFF
+
+
+def _tenths(value: float) -> int:
+    return min(_MAX_TENTHS, max(0, int(round(value * 10))))
+
+
+class ProcessRecorder:
+    """
+    Flight recorder for get_processes samples. Each frame stores only the
+    PIDs whose name/CPU/memory changed (plus removed PIDs); names live in a
+    shared string table. A full keyframe is written every `keyframe_interval`
+    frames, so seeking decodes at most one keyframe plus that many deltas.
+    Recording and reads are serialised by a lock, so one thread may record
+    while another scrubs.
+    """
+
+    def __init__(self, keyframe_interval: int = 300, max_age: float = 24 * 3600):
+        self.keyframe_interval = keyframe_interval
+        self.max_age = max_age
+        self._names: List[str] = []
+        self._name_index: Dict[str, int] = {}
+        self._frames: List[bytes] = []
+        self._times = array("d")
+        self._keyframes: List[int] = []
+        self._state: Dict[int, Tuple[int, int, int]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._frames)
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            return sum(len(f) for f in self._frames)
+
+    def time_range(self) -> Optional[Tuple[float, float]]:
+        with self._lock:
+            if not self._times:
+                return None
+            return self._times[0], self._times[-1]
+
+    def time_at(self, index: int) -> float:
+        with self._lock:
+            return self._times[index]
+
+    def _intern(self, name: str) -> int:
+        idx = self._name_index.get(name)
+        if idx is None:
+            idx = len(self._names)
+            self._names.append(name)
+            self._name_index[name] = idx
+        return idx
+
+    def record(self, processes: List[Dict[str, Any]], timestamp: Optional[float] = None):
+        with self._lock:
+            timestamp = time.time() if timestamp is None else timestamp
+            state = {}
+            for proc in processes:
+                state[proc['pid']] = (self._intern(proc['name'] or ""), _tenths(proc['cpu_percent']),
+                                      _tenths(proc['memory_percent']))
+
+            keyframe = not self._keyframes or len(self._frames) - self._keyframes[-1] >= self.keyframe_interval
+            if keyframe:
+                changed = state
+                removed = []
+            else:
+                previous = self._state
+                changed = {pid: v for pid, v in state.items() if previous.get(pid) != v}
+                removed = [pid for pid in previous if pid not in state]
+
+            parts = [_HEADER.pack(timestamp, keyframe, len(changed), len(removed))]
+            parts.extend(_ENTRY.pack(pid, *v) for pid, v in changed.items())
+            parts.extend(_PID.pack(pid) for pid in removed)
+
+            if keyframe:
+                self._keyframes.append(len(self._frames))
+            self._frames.append(b"".join(parts))
+            self._times.append(timestamp)
+            self._state = state
+            self._expire(timestamp)
+
+    def _expire(self, now: float):
+        # Drop whole keyframe groups so every remaining delta still has its base
+        if len(self._keyframes) < 2 or self._times[self._keyframes[1] - 1] >= now - self.max_age:
+            return
+        cut = self._keyframes[1]
+        del self._frames[:cut]
+        del self._times[:cut]
+        self._keyframes = [k - cut for k in self._keyframes[1:]]
+
+    @staticmethod
+    def _apply(frame: bytes, state: Dict[int, Tuple[int, int, int]]):
+        _, keyframe, n_changed, n_removed = _HEADER.unpack_from(frame, 0)
+        if keyframe:
+            state.clear()
+        offset = _HEADER.size
+        for _ in range(n_changed):
+            pid, name_idx, cpu, mem = _ENTRY.unpack_from(frame, offset)
+            state[pid] = (name_idx, cpu, mem)
+            offset += _ENTRY.size
+        for _ in range(n_removed):
+            state.pop(_PID.unpack_from(frame, offset)[0], None)
+            offset += _PID.size
+
+    def index_at(self, timestamp: float) -> int:
+        """Index of the last frame recorded at or before `timestamp` (-1 if none)."""
+        with self._lock:
+            return bisect_right(self._times, timestamp) - 1
+
+    def snapshot(self, index: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            if index < 0 or index >= len(self._frames):
+                return []
+            start = self._keyframes[bisect_right(self._keyframes, index) - 1]
+            state: Dict[int, Tuple[int, int, int]] = {}
+            for i in range(start, index + 1):
+                self._apply(self._frames[i], state)
+            return [
+                {'name': self._names[name_idx], 'pid': pid, 'cpu_percent': cpu / 10, 'memory_percent': mem / 10}
+                for pid, (name_idx, cpu, mem) in state.items()
+            ]
+
+    def snapshot_at(self, timestamp: float) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self.snapshot(self.index_at(timestamp))
@@ -0,0 +1,99 @@
+import heapq
+import itertools
+import datetime
+from typing import Dict, List, Optional
+
+DUE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+RECURRENCE_RULES = {
+    "Hourly": datetime.timedelta(hours=1),
+    "Daily": datetime.timedelta(days=1),
+    "Weekly": datetime.timedelta(weeks=1),
+}
+
+
+def parse_due(value: Optional[str]) -> Optional[datetime.datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.datetime.strptime(value, DUE_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def format_due(value: datetime.datetime) -> str:
+    return value.strftime(DUE_FORMAT)
+
+
+def next_occurrence(due: datetime.datetime, recurrence: Optional[str],
+                    now: datetime.datetime) -> Optional[datetime.datetime]:
+    """Returns the first occurrence of a recurring due date strictly after `now`."""
+    step = RECURRENCE_RULES.get(recurrence)
+    if step is None:
+        return None
+    if due > now:
+        return due
+    # Jump over every missed occurrence at once instead of looping per step
+    missed = (now - due) // step + 1
+    return due + step * missed
+
+
+class ReminderScheduler:
+    """
+    Min-heap of (fire_at, seq, task_id) entries. Cancelled or rescheduled
+    entries are invalidated in place and discarded lazily when they reach
+    the top, so schedule/cancel are O(log N) / O(1) and nothing ever walks
+    the whole task list.
+    """
+
+    def __init__(self):
+        self._heap: List[list] = []
+        self._entries: Dict[str, list] = {}
+        self._counter = itertools.count()
+        self._stale = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._entries
+
+    def schedule(self, task_id: str, fire_at: float):
+        self.cancel(task_id)
+        entry = [fire_at, next(self._counter), task_id, True]
+        self._entries[task_id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def cancel(self, task_id: str):
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return
+        entry[3] = False
+        self._stale += 1
+        # Rebuild once dead entries dominate so the heap can't grow unbounded
+        if self._stale > 64 and self._stale > len(self._entries):
+            self._heap = [e for e in self._heap if e[3]]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def _discard_stale(self):
+        while self._heap and not self._heap[0][3]:
+            heapq.heappop(self._heap)
+            self._stale -= 1
+
+    def next_fire_time(self) -> Optional[float]:
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> List[str]:
+        due = []
+        self._discard_stale()
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if entry[3]:
+                del self._entries[entry[2]]
+                due.append(entry[2])
+            else:
+                self._stale -= 1
+            self._discard_stale()
+        return due
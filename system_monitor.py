@@ -1,13 +1,29 @@
 import psutil
 import datetime
 import time
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, List, Iterable, Optional, Tuple, Union
+from recorder import ProcessRecorder
 
 class SystemMonitor:
     def __init__(self):
         self.last_net_io = psutil.net_io_counters()
         self.last_time = time.time()
         self._proc_cache = {}
+        # Guards the process cache and task attribution state, which the
+        # sampler thread and the GUI thread both touch
+        self.lock = threading.RLock()
+        # Per-task process bindings and running usage aggregates
+        self._task_bindings: Dict[str, Dict[str, set]] = {}
+        self._bound_names: Dict[str, set] = {}
+        self._active_task: Optional[str] = None
+        self._active_pids: set = set()
+        self._cpu_time_last: Dict[int, float] = {}
+        self._last_sample_time: Optional[float] = None
+        self._activated_at: Optional[float] = None
+        self.task_usage: Dict[str, Dict[str, float]] = {}
+        # Optional flight recorder fed with every full (untruncated) sample
+        self.recorder: Optional[ProcessRecorder] = None
         psutil.cpu_percent(interval=None)
 
     @staticmethod
@@ -60,39 +76,195 @@ class SystemMonitor:
             return {"sent": 0.0, "recv": 0.0}
 
     def get_processes(self) -> List[Dict[str, Any]]:
-        processes = []
-        current_pids = set()
-        try:
-            for proc in psutil.process_iter(['pid', 'name', 'memory_percent']):
-                try:
-                    pid = proc.info['pid']
-                    current_pids.add(pid)
+        with self.lock:
+            processes = []
+            current_pids = set()
+            try:
+                for proc in psutil.process_iter(['pid', 'name', 'memory_percent']):
+                    try:
+                        pid = proc.info['pid']
+                        current_pids.add(pid)
+                        if pid not in self._proc_cache:
+                            self._proc_cache[pid] = proc
                     
-                    if pid not in self._proc_cache:
-                        self._proc_cache[pid] = proc
+                        if self._active_task is not None and proc.info['name'] in self._bound_names.get(self._active_task, ()):
+                            self._track_pid(pid)
                     
-                    cached_proc = self._proc_cache[pid]
-                    # cpu_percent(interval=None) compares since last call on THIS object
-                    cpu = cached_proc.cpu_percent(interval=None)
+                        cached_proc = self._proc_cache[pid]
+                        # cpu_percent(interval=None) compares since last call on THIS object
+                        cpu = cached_proc.cpu_percent(interval=None)
                     
-                    pinfo = {
-                        'name': proc.info['name'],
-                        'pid': pid,
-                        'cpu_percent': round(cpu, 1),
-                        'memory_percent': round(proc.info['memory_percent'], 1)
-                    }
-                    processes.append(pinfo)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+                        pinfo = {
+                            'name': proc.info['name'],
+                            'pid': pid,
+                            'cpu_percent': round(cpu, 1),
+                            'memory_percent': round(proc.info['memory_percent'], 1)
+                        }
+                        processes.append(pinfo)
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        continue
             
-            # Cleanup cache
-            for pid in list(self._proc_cache.keys()):
-                if pid not in current_pids:
-                    del self._proc_cache[pid]
+                # Cleanup cache
+                for pid in list(self._proc_cache.keys()):
+                    if pid not in current_pids:
+                        del self._proc_cache[pid]
+                        self._cpu_time_last.pop(pid, None)
 
-            return sorted(processes, key=lambda x: x['cpu_percent'], reverse=True)[:50]
-        except Exception:
-            return []
+                if self.recorder is not None:
+                    self.recorder.record(processes)
+
+                return sorted(processes, key=lambda x: x['cpu_percent'], reverse=True)[:50]
+            except Exception:
+                return []
+
+    def bind_task(self, task_id: str, targets: Iterable[Union[str, int]]):
+        """Binds a task to process names and/or PIDs (numeric strings count as PIDs)."""
+        names, pids = set(), set()
+        for target in targets:
+            target = str(target).strip()
+            if not target:
+                continue
+            if target.isdigit():
+                pids.add(int(target))
+            else:
+                names.add(target)
+        with self.lock:
+            self._task_bindings[task_id] = {"names": names, "pids": pids}
+            self._bound_names[task_id] = names
+            if task_id == self._active_task:
+                self._resolve_active_pids()
+
+    def unbind_task(self, task_id: str):
+        with self.lock:
+            self._task_bindings.pop(task_id, None)
+            self._bound_names.pop(task_id, None)
+            if task_id == self._active_task:
+                # The task stays active; it just has nothing to attribute until rebound
+                self._active_pids = set()
+                self._cpu_time_last = {}
+
+    @property
+    def active_task(self) -> Optional[str]:
+        return self._active_task
+
+    def get_task_usage(self, task_id: str) -> Optional[Dict[str, float]]:
+        with self.lock:
+            usage = self.task_usage.get(task_id)
+            return dict(usage) if usage is not None else None
+
+    def set_task_usage(self, task_id: str, usage: Optional[Dict[str, float]]):
+        with self.lock:
+            if usage is None:
+                self.task_usage.pop(task_id, None)
+            else:
+                self.task_usage[task_id] = dict(usage)
+
+    def set_active_task(self, task_id: Optional[str]):
+        with self.lock:
+            self._active_task = task_id
+            self._active_pids = set()
+            self._cpu_time_last = {}
+            # Baselines are taken now so the first interval is attributed too
+            self._activated_at = time.time() if task_id is not None else None
+            self._last_sample_time = self._activated_at
+            self._resolve_active_pids()
+
+    def _resolve_active_pids(self):
+        """
+        Matches the active binding against running processes, keeping existing
+        baselines. This is the only full scan; afterwards get_processes picks
+        up newly started processes with a bound name.
+        """
+        binding = self._task_bindings.get(self._active_task)
+        if binding is None:
+            self._active_pids = set()
+            self._cpu_time_last = {}
+            return
+        pids = set(binding["pids"])
+        if binding["names"]:
+            try:
+                for proc in psutil.process_iter(['name']):
+                    if proc.info['name'] in binding["names"]:
+                        pids.add(proc.pid)
+            except Exception:
+                pass
+        for pid in self._active_pids - pids:
+            self._active_pids.discard(pid)
+            self._cpu_time_last.pop(pid, None)
+        for pid in pids:
+            self._track_pid(pid)
+
+    def _track_pid(self, pid: int):
+        if pid in self._active_pids:
+            return
+        try:
+            proc = self._bound_process(pid)
+            with proc.oneshot():
+                times = proc.cpu_times()
+                created = proc.create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return
+        self._active_pids.add(pid)
+        # Processes started after activation count in full; older ones from now on
+        started_after = self._activated_at is not None and created >= self._activated_at
+        self._cpu_time_last[pid] = 0.0 if started_after else times.user + times.system
+
+    def _bound_process(self, pid: int) -> Optional[psutil.Process]:
+        proc = self._proc_cache.get(pid)
+        if proc is None:
+            proc = psutil.Process(pid)
+            self._proc_cache[pid] = proc
+        return proc
+
+    def sample_task_usage(self) -> Optional[Dict[str, float]]:
+        """
+        Attributes CPU time and memory of the active task's bound processes
+        since the previous sample. Only bound PIDs are touched, so the cost
+        does not depend on how many processes are running.
+        """
+        with self.lock:
+            task_id = self._active_task
+            if task_id is None:
+                return None
+            now = time.time()
+            elapsed = now - self._last_sample_time if self._last_sample_time is not None else 0.0
+            self._last_sample_time = now
+
+            cpu_delta = 0.0
+            rss_mb = 0.0
+            for pid in list(self._active_pids):
+                try:
+                    proc = self._bound_process(pid)
+                    with proc.oneshot():
+                        times = proc.cpu_times()
+                        rss_mb += proc.memory_info().rss / (1024**2)
+                    cpu_total = times.user + times.system
+                    last = self._cpu_time_last.get(pid, cpu_total)
+                    if cpu_total >= last:
+                        cpu_delta += cpu_total - last
+                    self._cpu_time_last[pid] = cpu_total
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    self._active_pids.discard(pid)
+                    self._cpu_time_last.pop(pid, None)
+                    self._proc_cache.pop(pid, None)
+
+            usage = self.task_usage.setdefault(task_id, {
+                "cpu_seconds": 0.0, "active_seconds": 0.0, "mem_mb_seconds": 0.0, "peak_mem_mb": 0.0
+            })
+            usage["cpu_seconds"] += cpu_delta
+            usage["active_seconds"] += elapsed
+            usage["mem_mb_seconds"] += rss_mb * elapsed
+            usage["peak_mem_mb"] = max(usage["peak_mem_mb"], rss_mb)
+            return usage
+
+    @staticmethod
+    def summarize_usage(usage: Dict[str, float]) -> Dict[str, float]:
+        active = usage.get("active_seconds", 0.0)
+        return {
+            "cpu_seconds": round(usage.get("cpu_seconds", 0.0), 1),
+            "avg_mem_mb": round(usage.get("mem_mb_seconds", 0.0) / active, 1) if active > 0 else 0.0,
+            "peak_mem_mb": round(usage.get("peak_mem_mb", 0.0), 1),
+        }
 
     def get_all_metrics(self) -> Dict[str, Any]:
         return {
@@ -102,3 +274,64 @@ class SystemMonitor:
             "disk": self.get_disk_info(),
             "network": self.get_network_speed()
         }
+
+
+class ProcessSampler:
+    """
+    Runs the full get_processes scan (which also feeds the monitor's
+    recorder) and the active task's usage sample on a background thread,
+    so neither blocks the GUI. The GUI only copies the latest results.
+    """
+
+    def __init__(self, monitor: SystemMonitor, interval: float = 1.0):
+        self.monitor = monitor
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._processes: List[Dict[str, Any]] = []
+        self._usage: Optional[Tuple[str, Dict[str, float]]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="process-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join(timeout=2)
+        self._thread = None
+
+    def latest_processes(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self._processes
+
+    def latest_usage(self, task_id: str) -> Optional[Dict[str, float]]:
+        """Latest usage totals for `task_id`, or None if it wasn't the task last sampled."""
+        with self._lock:
+            if self._usage is None or self._usage[0] != task_id:
+                return None
+            return self._usage[1]
+
+    def sample(self):
+        processes = self.monitor.get_processes()
+        with self.monitor.lock:
+            task_id = self.monitor.active_task
+            usage = self.monitor.sample_task_usage()
+            usage = (task_id, dict(usage)) if usage is not None else None
+        with self._lock:
+            self._processes = processes
+            self._usage = usage
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
@@ -0,0 +1,184 @@
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+
+from agent import (MetricsAgent, FRAME_HEADER, FRAME_KEYFRAME, FRAME_DELTA, FIELDS,
+                   encode_frame, encode_hello, encode_snapshot, decode_snapshot,
+                   flatten_metrics, unflatten_metrics)
+from aggregator import AgentAggregator, parse_endpoint
+
+
+def _metrics(cpu):
+    return {
+        "cpu": cpu,
+        "memory": {"total": 16.0, "available": 8.0, "percent": 50.0},
+        "disk": {"total": 100.0, "used": 40.0, "free": 60.0, "percent": 40.0},
+        "network": {"sent": 1.5, "recv": 2.5},
+    }
+
+
+def _split(frame):
+    length, frame_type = FRAME_HEADER.unpack_from(frame, 0)
+    payload = frame[FRAME_HEADER.size:]
+    assert len(payload) == length
+    return frame_type, payload
+
+
+class FakeMonitor:
+    def __init__(self, cpu):
+        self.cpu = cpu
+
+    def get_all_metrics(self):
+        return _metrics(self.cpu)
+
+
+def test_keyframe_and_delta_round_trip():
+    first = flatten_metrics(_metrics(10.0))
+    second = flatten_metrics(_metrics(20.0))
+
+    frame_type, payload = _split(encode_snapshot(1.0, first))
+    assert frame_type == FRAME_KEYFRAME
+    timestamp, decoded = decode_snapshot(frame_type, payload, None)
+    assert timestamp == 1.0 and decoded == first
+
+    delta = encode_snapshot(2.0, second, first)
+    frame_type, payload = _split(delta)
+    assert frame_type == FRAME_DELTA
+    # Only the CPU field changed, so the delta is much smaller than a keyframe
+    assert len(delta) < len(encode_snapshot(2.0, second))
+    timestamp, decoded = decode_snapshot(frame_type, payload, first)
+    assert timestamp == 2.0 and decoded == second
+    assert unflatten_metrics(decoded) == _metrics(20.0)
+    assert len(decoded) == len(FIELDS)
+
+
+def test_delta_before_keyframe_raises():
+    values = flatten_metrics(_metrics(10.0))
+    frame_type, payload = _split(encode_snapshot(1.0, values, values))
+    with pytest.raises(ValueError):
+        decode_snapshot(frame_type, payload, None)
+
+
+@pytest.mark.parametrize("make_frame", [
+    lambda values: encode_snapshot(1.0, values)[:-3],
+    lambda values: encode_snapshot(2.0, flatten_metrics(_metrics(20.0)), values)[:-1],
+    lambda values: encode_frame(FRAME_DELTA, b"\x00"),
+])
+def test_truncated_frames_raise_value_error(make_frame):
+    values = flatten_metrics(_metrics(10.0))
+    frame = make_frame(values)
+    frame_type = FRAME_HEADER.unpack_from(frame, 0)[1]
+    with pytest.raises(ValueError):
+        decode_snapshot(frame_type, frame[FRAME_HEADER.size:], values)
+
+
+@pytest.mark.parametrize("endpoint, expected", [
+    ("example:9000", ("example", 9000, None)),
+    ("example", ("example", 9700, None)),
+    ("[::1]:9000", ("::1", 9000, None)),
+    ("unix:/tmp/agent.sock", (None, None, "/tmp/agent.sock")),
+])
+def test_parse_endpoint(endpoint, expected):
+    assert parse_endpoint(endpoint) == expected
+
+
+@pytest.mark.parametrize("endpoint", ["::1", "unix:", ":9000", "host:70000"])
+def test_parse_endpoint_rejects(endpoint):
+    with pytest.raises(ValueError):
+        parse_endpoint(endpoint)
+
+
+@pytest.fixture
+def agents():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    agents = [MetricsAgent(FakeMonitor(10.0 * (i + 1)), interval=0.05, hostname=f"host{i}") for i in range(3)]
+    for agent in agents:
+        asyncio.run_coroutine_threadsafe(agent.serve("127.0.0.1", 0), loop)
+    deadline = time.time() + 5
+    while any(agent.server is None for agent in agents) and time.time() < deadline:
+        time.sleep(0.01)
+    yield agents
+
+    async def shutdown():
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout=5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=2)
+    loop.close()
+
+
+def test_aggregator_multiplexes_local_agents(agents):
+    aggregator = AgentAggregator(reconnect_delay=0.1)
+    endpoints = []
+    for agent in agents:
+        port = agent.server.sockets[0].getsockname()[1]
+        endpoints.append(f"127.0.0.1:{port}")
+        assert aggregator.add_agent(endpoints[-1])
+    try:
+        deadline = time.time() + 5
+        while time.time() < deadline and any(aggregator.latest(e) is None for e in endpoints):
+            time.sleep(0.05)
+        for i, endpoint in enumerate(endpoints):
+            metrics = aggregator.latest(endpoint)
+            assert metrics is not None
+            assert metrics["cpu"] == 10.0 * (i + 1)
+            assert metrics["memory"]["percent"] == 50.0
+            assert aggregator.label(endpoint) == f"host{i}"
+    finally:
+        aggregator.stop()
+
+
+def test_unreachable_agent_is_offline():
+    aggregator = AgentAggregator(reconnect_delay=0.1)
+    try:
+        assert aggregator.add_agent("unix:/nonexistent/agent.sock")
+        time.sleep(0.2)
+        assert aggregator.latest("unix:/nonexistent/agent.sock") is None
+        assert aggregator.label("unix:/nonexistent/agent.sock").endswith("(offline)")
+    finally:
+        aggregator.stop()
+
+
+def test_malformed_frame_drops_connection_and_reconnects():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    port = server.getsockname()[1]
+    good = encode_snapshot(1.0, flatten_metrics(_metrics(42.0)))
+    # First connection sends a keyframe cut short, the second a valid one
+    frames = [encode_frame(FRAME_KEYFRAME, good[FRAME_HEADER.size:-4]), good]
+    connections = []
+
+    def serve():
+        for frame in frames:
+            conn, _ = server.accept()
+            conn.sendall(encode_hello("flaky") + frame)
+            connections.append(conn)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    aggregator = AgentAggregator(reconnect_delay=0.1)
+    endpoint = f"127.0.0.1:{port}"
+    try:
+        assert aggregator.add_agent(endpoint)
+        deadline = time.time() + 5
+        while time.time() < deadline and aggregator.latest(endpoint) is None:
+            time.sleep(0.05)
+        metrics = aggregator.latest(endpoint)
+        assert metrics is not None and metrics["cpu"] == 42.0
+        assert len(connections) == 2
+    finally:
+        aggregator.stop()
+        thread.join(timeout=2)
+        for conn in connections:
+            conn.close()
+        server.close()
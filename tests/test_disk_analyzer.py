@@ -0,0 +1,97 @@
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+import disk_analyzer
+from disk_analyzer import DiskUsageAnalyzer
+
+
+def _write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "root"
+    _write(str(root / "top.bin"), 100)
+    _write(str(root / "a" / "one.bin"), 1000)
+    _write(str(root / "a" / "b" / "two.bin"), 2000)
+    _write(str(root / "a" / "b" / "c" / "three.bin"), 3000)
+    # Shares the "b" prefix, so a sloppy subtree delete would catch it
+    _write(str(root / "a" / "b2" / "four.bin"), 400)
+    return str(root)
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    return DiskUsageAnalyzer(cache_path=str(tmp_path / "cache.db"), workers=4, track_depth=1)
+
+
+def _scan(analyzer, root, **kwargs):
+    assert analyzer.start(root, **kwargs)
+    analyzer._thread.join(timeout=10)
+    snapshot = analyzer.snapshot()
+    assert snapshot["done"]
+    return snapshot
+
+
+def _cached_paths(analyzer):
+    with sqlite3.connect(analyzer.cache_path) as conn:
+        return {row[0] for row in conn.execute("SELECT path FROM dirs")}
+
+
+def test_scan_rolls_deep_directories_into_tracked_ancestor(analyzer, tree):
+    snapshot = _scan(analyzer, tree)
+    totals = dict(snapshot["largest"])
+    assert snapshot["total_bytes"] == 6500
+    assert snapshot["files"] == 5
+    assert snapshot["scanned_dirs"] == 5
+    assert snapshot["reused_dirs"] == 0
+    # track_depth=1: everything under root/a is accounted to root/a itself
+    assert totals[os.path.join(tree, "a")] == 6400
+    assert set(totals) == {tree, os.path.join(tree, "a")}
+
+
+def test_rescan_reuses_unchanged_directories(analyzer, tree):
+    _scan(analyzer, tree)
+    snapshot = _scan(analyzer, tree)
+    assert snapshot["total_bytes"] == 6500
+    assert snapshot["reused_dirs"] == snapshot["scanned_dirs"] == 5
+
+    snapshot = _scan(analyzer, tree, full=True)
+    assert snapshot["reused_dirs"] == 0
+
+
+def test_deleted_subtree_is_dropped_from_totals_and_cache(analyzer, tree):
+    _scan(analyzer, tree)
+    b = os.path.join(tree, "a", "b")
+    assert {b, os.path.join(b, "c")} <= _cached_paths(analyzer)
+
+    shutil.rmtree(b)
+    snapshot = _scan(analyzer, tree)
+    assert snapshot["total_bytes"] == 1500
+    assert dict(snapshot["largest"])[os.path.join(tree, "a")] == 1400
+    # Only root/a changed; root and root/a/b2 come from the cache
+    assert snapshot["reused_dirs"] == 2
+
+    paths = _cached_paths(analyzer)
+    assert b not in paths
+    assert os.path.join(b, "c") not in paths
+    assert os.path.join(tree, "a", "b2") in paths
+
+
+def test_cancel_stops_scan(analyzer, tree, monkeypatch):
+    scan_dir = disk_analyzer._scan_dir
+
+    def cancel_after_first(*args):
+        analyzer.cancel()
+        return scan_dir(*args)
+
+    monkeypatch.setattr(disk_analyzer, "_scan_dir", cancel_after_first)
+    snapshot = _scan(analyzer, tree)
+    assert snapshot["cancelled"]
+    assert snapshot["scanned_dirs"] < 5
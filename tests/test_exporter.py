@@ -0,0 +1,92 @@
+import http.client
+import json
+
+import pytest
+
+from exporter import MetricsExporter, render_prometheus, PROMETHEUS_CONTENT_TYPE, JSON_CONTENT_TYPE
+
+METRICS = {
+    "timestamp": "12:00:00",
+    "cpu": 12.5,
+    "memory": {"total": 16.0, "available": 8.0, "percent": 50.0},
+    "disk": {"total": 100.0, "used": 40.0, "free": 60.0, "percent": 40.0},
+    "network": {"sent": 1.5, "recv": 2.5},
+}
+PROCESSES = [{"name": "python", "pid": 42, "cpu_percent": 3.2, "memory_percent": 1.1}]
+
+
+@pytest.fixture
+def exporter():
+    exporter = MetricsExporter(port=0)
+    assert exporter.start()
+    exporter.publish(METRICS, PROCESSES)
+    yield exporter
+    exporter.stop()
+
+
+def _get(exporter, path):
+    conn = http.client.HTTPConnection(*exporter.address, timeout=5)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        return response.status, response.getheader("Content-Type"), response.read()
+    finally:
+        conn.close()
+
+
+def test_prometheus_endpoint(exporter):
+    status, content_type, body = _get(exporter, "/metrics")
+    assert status == 200
+    assert content_type == PROMETHEUS_CONTENT_TYPE
+    text = body.decode("utf-8")
+    assert "smart_task_cpu_percent 12.5" in text
+    assert 'smart_task_process_cpu_percent{pid="42",name="python"} 3.2' in text
+
+
+def test_json_endpoint(exporter):
+    status, content_type, body = _get(exporter, "/metrics.json")
+    assert status == 200
+    assert content_type == JSON_CONTENT_TYPE
+    assert json.loads(body) == {"metrics": METRICS, "processes": PROCESSES}
+
+
+def test_unknown_path_is_404(exporter):
+    status, _, _ = _get(exporter, "/nope")
+    assert status == 404
+
+
+def test_publish_updates_next_scrape(exporter):
+    exporter.publish(metrics=dict(METRICS, cpu=99.0))
+    _, _, body = _get(exporter, "/metrics")
+    assert "smart_task_cpu_percent 99.0" in body.decode("utf-8")
+    _, _, body = _get(exporter, "/metrics.json")
+    assert json.loads(body)["metrics"]["cpu"] == 99.0
+
+
+def test_label_escaping():
+    processes = [{"name": 'we"ird\\name\n', "pid": 7, "cpu_percent": 1.0, "memory_percent": 0.5}]
+    text = render_prometheus(METRICS, processes).decode("utf-8")
+    assert 'name="we\\"ird\\\\name\\n"' in text
+
+
+def test_stop_closes_keep_alive_connections():
+    exporter = MetricsExporter(port=0)
+    assert exporter.start()
+    exporter.publish(METRICS, PROCESSES)
+    conn = http.client.HTTPConnection(*exporter.address, timeout=5)
+    try:
+        conn.request("GET", "/metrics")
+        response = conn.getresponse()
+        assert response.status == 200
+        response.read()
+
+        exporter.stop()
+        # The reused connection must no longer be served the frozen buffer
+        try:
+            conn.request("GET", "/metrics")
+            response = conn.getresponse()
+        except (ConnectionError, http.client.HTTPException, OSError):
+            return
+        assert response.status != 200
+    finally:
+        conn.close()
@@ -0,0 +1,70 @@
+from recorder import ProcessRecorder
+
+
+def _proc(pid, name, cpu, mem):
+    return {'name': name, 'pid': pid, 'cpu_percent': cpu, 'memory_percent': mem}
+
+
+def _by_pid(processes):
+    return {p['pid']: p for p in processes}
+
+
+SAMPLES = [
+    [_proc(1, "init", 0.0, 0.1), _proc(10, "python", 12.5, 3.2)],
+    # pid 20 appears, python's CPU changes
+    [_proc(1, "init", 0.0, 0.1), _proc(10, "python", 40.0, 3.3), _proc(20, "bash", 0.1, 0.4)],
+    # pid 10 exits, init unchanged
+    [_proc(1, "init", 0.0, 0.1), _proc(20, "bash", 0.0, 0.4)],
+    # pid 10 is reused by a different program
+    [_proc(1, "init", 0.0, 0.1), _proc(10, "sshd", 0.3, 0.2), _proc(20, "bash", 0.0, 0.4)],
+]
+
+
+def _record_all(recorder, samples, start=1000.0):
+    for i, sample in enumerate(samples):
+        recorder.record(sample, timestamp=start + i)
+
+
+def test_round_trip_with_added_and_removed_pids():
+    recorder = ProcessRecorder(keyframe_interval=100)
+    _record_all(recorder, SAMPLES)
+    assert len(recorder) == len(SAMPLES)
+    for i, sample in enumerate(SAMPLES):
+        assert _by_pid(recorder.snapshot(i)) == _by_pid(sample)
+
+
+def test_deltas_store_only_changes():
+    recorder = ProcessRecorder(keyframe_interval=100)
+    _record_all(recorder, [SAMPLES[0], SAMPLES[0]])
+    keyframe, unchanged = recorder._frames
+    assert len(unchanged) < len(keyframe)
+
+
+def test_seek_across_keyframe_boundary():
+    recorder = ProcessRecorder(keyframe_interval=3)
+    samples = [[_proc(1, "init", 0.0, 0.1), _proc(100 + i, f"job{i}", float(i), 1.0)] for i in range(8)]
+    _record_all(recorder, samples)
+    assert recorder._keyframes == [0, 3, 6]
+    # Frames on either side of each keyframe decode against the right base
+    for i in (2, 3, 4, 5, 6, 7):
+        assert _by_pid(recorder.snapshot(i)) == _by_pid(samples[i])
+    assert _by_pid(recorder.snapshot_at(1004.5)) == _by_pid(samples[4])
+    assert recorder.index_at(999.0) == -1
+    assert recorder.snapshot(len(recorder)) == []
+
+
+def test_expiry_drops_whole_keyframe_group():
+    recorder = ProcessRecorder(keyframe_interval=3, max_age=4.0)
+    samples = [[_proc(1, "init", float(i), 0.1)] for i in range(7)]
+    # Up to t=1005 the newest frame of the first group (t=1002) is within max_age
+    _record_all(recorder, samples[:6])
+    assert len(recorder) == 6
+    assert recorder._keyframes == [0, 3]
+
+    recorder.record(samples[6], timestamp=1007.0)
+    # t=1000..1002 expired together; the survivors still start on a keyframe
+    assert len(recorder) == 4
+    assert recorder._keyframes == [0, 3]
+    assert recorder.time_range() == (1003.0, 1007.0)
+    for i in range(4):
+        assert _by_pid(recorder.snapshot(i)) == _by_pid(samples[3 + i])
@@ -0,0 +1,74 @@
+import datetime
+
+from scheduler import ReminderScheduler, next_occurrence, parse_due, format_due
+
+
+def test_pop_due_returns_in_fire_order():
+    scheduler = ReminderScheduler()
+    scheduler.schedule("c", 30.0)
+    scheduler.schedule("a", 10.0)
+    scheduler.schedule("b", 20.0)
+    assert scheduler.next_fire_time() == 10.0
+    assert scheduler.pop_due(25.0) == ["a", "b"]
+    assert scheduler.pop_due(25.0) == []
+    assert len(scheduler) == 1 and "c" in scheduler
+
+
+def test_reschedule_replaces_previous_entry():
+    scheduler = ReminderScheduler()
+    scheduler.schedule("a", 10.0)
+    scheduler.schedule("b", 20.0)
+    scheduler.schedule("a", 30.0)
+    assert len(scheduler) == 2
+    assert scheduler.next_fire_time() == 20.0
+    assert scheduler.pop_due(100.0) == ["b", "a"]
+
+
+def test_pop_due_skips_cancelled_entries():
+    scheduler = ReminderScheduler()
+    for i in range(5):
+        scheduler.schedule(str(i), float(i))
+    scheduler.cancel("0")
+    scheduler.cancel("3")
+    scheduler.cancel("missing")
+    assert scheduler.next_fire_time() == 1.0
+    assert scheduler.pop_due(10.0) == ["1", "2", "4"]
+    assert scheduler.next_fire_time() is None
+    assert scheduler._stale == 0
+
+
+def test_heap_is_rebuilt_once_stale_entries_dominate():
+    scheduler = ReminderScheduler()
+    for i in range(200):
+        scheduler.schedule(str(i), float(i))
+    # Cancelling from the back keeps dead entries out of the heap top, so only a rebuild drops them
+    for i in range(199, 99, -1):
+        scheduler.cancel(str(i))
+    assert len(scheduler._heap) == 200
+    scheduler.cancel("99")
+    assert len(scheduler._heap) == 99
+    assert scheduler._stale == 0
+    assert scheduler.pop_due(1000.0) == [str(i) for i in range(99)]
+
+
+def test_next_occurrence_skips_missed_occurrences():
+    due = datetime.datetime(2026, 1, 1, 9, 0)
+    now = datetime.datetime(2026, 1, 10, 12, 0)
+    assert next_occurrence(due, "Daily", now) == datetime.datetime(2026, 1, 11, 9, 0)
+    assert next_occurrence(due, "Weekly", now) == datetime.datetime(2026, 1, 15, 9, 0)
+    assert next_occurrence(due, "Hourly", now) == datetime.datetime(2026, 1, 10, 13, 0)
+    # Exactly on an occurrence still moves strictly past now
+    assert next_occurrence(due, "Daily", datetime.datetime(2026, 1, 3, 9, 0)) == datetime.datetime(2026, 1, 4, 9, 0)
+
+
+def test_next_occurrence_future_and_one_shot():
+    due = datetime.datetime(2026, 1, 1, 9, 0)
+    assert next_occurrence(due, "Daily", datetime.datetime(2025, 12, 31)) == due
+    assert next_occurrence(due, None, datetime.datetime(2026, 1, 2)) is None
+
+
+def test_due_format_round_trip():
+    value = datetime.datetime(2026, 10, 19, 14, 5)
+    assert parse_due(format_due(value)) == value
+    assert parse_due("not a date") is None
+    assert parse_due(None) is None
@@ -0,0 +1,76 @@
+import os
+import time
+
+import pytest
+
+psutil = pytest.importorskip("psutil")
+
+from recorder import ProcessRecorder
+from system_monitor import SystemMonitor, ProcessSampler
+
+
+def _burn_cpu(seconds):
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+
+
+def test_first_interval_after_activation_is_attributed():
+    monitor = SystemMonitor()
+    monitor.bind_task("t", [str(os.getpid())])
+    monitor.set_active_task("t")
+    _burn_cpu(0.2)
+    usage = monitor.sample_task_usage()
+    assert usage["cpu_seconds"] >= 0.15
+    assert usage["peak_mem_mb"] > 0
+
+
+def test_task_stays_active_across_unbind_and_rebind():
+    monitor = SystemMonitor()
+    monitor.bind_task("t", [str(os.getpid())])
+    monitor.set_active_task("t")
+    monitor.unbind_task("t")
+    assert monitor.sample_task_usage() is not None
+    assert monitor._active_pids == set()
+
+    monitor.bind_task("t", [str(os.getpid())])
+    _burn_cpu(0.1)
+    usage = monitor.sample_task_usage()
+    assert usage is not None
+    assert os.getpid() in monitor._active_pids
+    assert usage["cpu_seconds"] >= 0.05
+
+
+def test_name_bindings_are_discovered_by_get_processes():
+    monitor = SystemMonitor()
+    name = psutil.Process().name()
+    monitor.bind_task("t", ["no-such-process-name"])
+    monitor.set_active_task("t")
+    assert monitor._active_pids == set()
+    # Simulate a binding whose process shows up later: only get_processes should find it
+    monitor._bound_names["t"] = {name}
+    monitor.sample_task_usage()
+    assert os.getpid() not in monitor._active_pids
+    monitor.get_processes()
+    assert os.getpid() in monitor._active_pids
+
+
+def test_sampler_scans_and_records_off_the_calling_thread():
+    monitor = SystemMonitor()
+    monitor.recorder = ProcessRecorder()
+    monitor.bind_task("t", [str(os.getpid())])
+    monitor.set_active_task("t")
+    sampler = ProcessSampler(monitor, interval=0.05)
+    sampler.start()
+    try:
+        deadline = time.time() + 5
+        while len(monitor.recorder) < 2 and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        sampler.stop()
+    assert not sampler.running
+    assert len(monitor.recorder) >= 2
+    assert any(p["pid"] == os.getpid() for p in monitor.recorder.snapshot(len(monitor.recorder) - 1))
+    assert sampler.latest_processes()
+    assert sampler.latest_usage("t") is not None
+    assert sampler.latest_usage("other") is None